@@ -4,14 +4,28 @@ import mnemonic
 import pyopencl as cl
 import numpy as np
 from tronpy import Tron
-from tronpy.keys import PrivateKey
+from tronpy.keys import PrivateKey, keccak256
+import base58
 from concurrent.futures import ThreadPoolExecutor
 import json
 import threading
 import secrets
+import argparse
+from profiler import SearchProfiler, NULL_PROFILER
+from scheduler import JobScheduler
+from planner import DifficultyPlanner, benchmark
+
+# secp256k1 参数
+SECP256K1_P = 0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffefffffc2f
+SECP256K1_N = 0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141
+# GLV自同态：λ·(x, y) = (β·x, y)，λ³ ≡ 1 (mod n)，β³ ≡ 1 (mod p)
+GLV_BETA = 0x7ae96a2b657c07106e64479eac3434e99cf0497512f58995c1396c28719501ee
+GLV_LAMBDA = 0x5363ad4cc05c30e0a5261c028812645a122e22ea20816678df02967c1b23bd72
+GLV_BETA2 = GLV_BETA * GLV_BETA % SECP256K1_P
+GLV_LAMBDA2 = GLV_LAMBDA * GLV_LAMBDA % SECP256K1_N
 
 class USDTAddressGenerator:
-    def __init__(self, platform_index=None, device_index=None, mode='mnemonic'):
+    def __init__(self, platform_index=None, device_index=None, mode='mnemonic', profiler=None):
         self.client = Tron()
         self.found_addresses = []
         self.total_generated = 0
@@ -19,13 +33,23 @@ class USDTAddressGenerator:
         self.last_count = 0
         self.running = False
         self.mode = mode  # 'mnemonic' 或 'privatekey'
+        self.planner = None  # 当前模式的难度估算，用于显示预计剩余时间
+        self.start_time = None
+        # 预计剩余时间的速度基准（切换生成模式后速度变化很大，需要重新计算）
+        self.rate_start_time = None
+        self.rate_start_count = 0
+        self._progress = None  # 速度线程显示进度用的回调，由search设置
+        self.profiler = profiler  # SearchProfiler 实例，为None时不做性能分析
+        
+        # 运行中待应用的新配置 {'patterns', 'count', 'mode'}，在下一批次开始时生效
+        self._pending_config = None
+        self.config_lock = threading.Lock()
         
         # 初始化OpenCL
         self.init_gpu(platform_index, device_index)
         
-        # 创建速度统计线程，但不立即启动
-        self.speed_thread = threading.Thread(target=self._print_speed)
-        self.speed_thread.daemon = True
+        # 速度统计线程在每次generate_addresses时创建（线程只能启动一次）
+        self.speed_thread = None
 
     def list_gpu_devices(self):
         """列出所有可用的GPU设备"""
@@ -121,10 +145,17 @@ class USDTAddressGenerator:
             
             if time_diff > 0:
                 speed = count_diff / time_diff
+                # 预计剩余时间按开始以来的平均速度计算，比瞬时速度稳定
+                average_speed = ((current_count - self.rate_start_count)
+                                 / max(current_time - self.rate_start_time, 1e-9))
+                found, target, eta = self._progress(average_speed)
+                line = (f"\r当前速度: {speed:.2f} 个/秒 | "
+                        f"已找到: {found}/{target} | "
+                        f"已尝试: {current_count} 个")
+                if eta:
+                    line += f" | {eta}"
                 # 移除末尾的换行符，只使用\r
-                print(f"\r当前速度: {speed:.2f} 个/秒 | "
-                      f"已找到: {len(self.found_addresses)}/{self.target_count} | "
-                      f"已尝试: {current_count} 个", end='', flush=True)
+                print(line, end='', flush=True)
             
             self.last_time = current_time
             self.last_count = current_count
@@ -139,22 +170,34 @@ class USDTAddressGenerator:
         """生成随机私钥"""
         return secrets.token_hex(32)
     
+    def derive_private_key(self, mnemonic_words):
+        """从助记词派生私钥"""
+        seed = mnemonic.Mnemonic.to_seed(mnemonic_words)
+        return hashlib.sha256(seed).hexdigest()
+
+    def derive_public_key(self, private_key):
+        """从私钥计算公钥（64字节，不含前缀）"""
+        return PrivateKey(bytes.fromhex(private_key)).public_key.to_bytes()
+
+    def hash_public_key(self, public_key):
+        """对公钥做keccak256，得到带0x41前缀的21字节地址"""
+        return b"\x41" + keccak256(public_key)[-20:]
+
+    def encode_address(self, raw_address):
+        """将21字节地址编码为base58check地址"""
+        return base58.b58encode_check(raw_address).decode()
+
     def create_wallet_from_mnemonic(self, mnemonic_words):
         """从助记词创建钱包"""
-        seed = mnemonic.Mnemonic.to_seed(mnemonic_words)
-        private_key = hashlib.sha256(seed).hexdigest()
-        priv_key = PrivateKey(bytes.fromhex(private_key))
-        addr = priv_key.public_key.to_base58check_address()
-        return {
-            'address': addr,
-            'private_key': private_key,
-            'mnemonic': mnemonic_words
-        }
+        private_key = self.derive_private_key(mnemonic_words)
+        wallet = self.create_wallet_from_private_key(private_key)
+        wallet['mnemonic'] = mnemonic_words
+        return wallet
     
     def create_wallet_from_private_key(self, private_key):
         """从私钥创建钱包"""
-        priv_key = PrivateKey(bytes.fromhex(private_key))
-        addr = priv_key.public_key.to_base58check_address()
+        public_key = self.derive_public_key(private_key)
+        addr = self.encode_address(self.hash_public_key(public_key))
         return {
             'address': addr,
             'private_key': private_key,
@@ -169,6 +212,61 @@ class USDTAddressGenerator:
         else:
             private_key = self.generate_private_key()
             return self.create_wallet_from_private_key(private_key)
+
+    def symmetric_keys(self, private_key, public_key):
+        """利用GLV自同态和取负对称性，由一个公钥得到6组(私钥, 公钥)
+
+        ±λ^i·k 对应的公钥为 (β^i·x, ±y)，只需几次模乘，无需再做标量乘法
+        """
+        k = int(private_key, 16)
+        x = int.from_bytes(public_key[:32], 'big')
+        y_bytes = public_key[32:]
+        neg_y_bytes = (SECP256K1_P - int.from_bytes(y_bytes, 'big')).to_bytes(32, 'big')
+        keys = []
+        for k_i, x_i in ((k, x),
+                         (k * GLV_LAMBDA % SECP256K1_N, x * GLV_BETA % SECP256K1_P),
+                         (k * GLV_LAMBDA2 % SECP256K1_N, x * GLV_BETA2 % SECP256K1_P)):
+            x_bytes = x_i.to_bytes(32, 'big')
+            keys.append((f"{k_i:064x}", x_bytes + y_bytes))
+            keys.append((f"{SECP256K1_N - k_i:064x}", x_bytes + neg_y_bytes))
+        return keys
+
+    def create_wallets_from_private_key(self, private_key):
+        """从私钥一次创建6个钱包（一次标量乘法）"""
+        public_key = self.derive_public_key(private_key)
+        return self._build_wallets(self.symmetric_keys(private_key, public_key), '')
+
+    def _build_wallets(self, keys, mnemonic_words, timer=NULL_PROFILER):
+        """对一组(私钥, 公钥)做哈希和编码；每个阶段对整组计时一次，避免逐个计时的开销"""
+        t = timer.now()
+        raw_addresses = [self.hash_public_key(pub) for _, pub in keys]
+        t = timer.add('hash', t, len(keys))
+        addresses = [self.encode_address(raw) for raw in raw_addresses]
+        timer.add('encode', t, len(keys))
+        return [{
+            'address': addr,
+            'private_key': key,
+            'mnemonic': mnemonic_words
+        } for addr, (key, _) in zip(addresses, keys)]
+
+    def generate_wallets(self, timer=NULL_PROFILER):
+        """根据模式生成一组候选钱包：助记词模式1个，私钥模式6个
+
+        timer为SearchProfiler时记录random/derive/hash/encode各阶段耗时
+        """
+        t = timer.now()
+        if self.mode == 'mnemonic':
+            mnemonic_words = self.generate_mnemonic()
+            t = timer.add('random', t)
+            private_key = self.derive_private_key(mnemonic_words)
+            keys = [(private_key, self.derive_public_key(private_key))]
+        else:
+            mnemonic_words = ''
+            private_key = self.generate_private_key()
+            t = timer.add('random', t)
+            keys = self.symmetric_keys(private_key, self.derive_public_key(private_key))
+        timer.add('derive', t)
+        return self._build_wallets(keys, mnemonic_words, timer)
     
     def check_pattern(self, address, patterns):
         """检查地址是否符合模式（检查地址结尾，不区分大小写）"""
@@ -189,34 +287,121 @@ class USDTAddressGenerator:
     
     def generate_addresses(self, patterns, count=1000):
         """生成指定数量的地址并检查是否符合模式"""
-        # 保存目标数量
+        # 保存目标数量和模式（运行中可能被update_patterns替换）
         self.target_count = count
+        self.patterns = patterns
+        self.planner = DifficultyPlanner(patterns, count)
+        self.found_addresses = []
+        with self.config_lock:
+            self._pending_config = None
+        
+        def should_continue():
+            if self._pending_config is not None:
+                self._apply_pending_config()
+            return len(self.found_addresses) < self.target_count
+        
+        def on_hit(wallet, matched):
+            self.found_addresses.append(wallet)
+            self.report_found(wallet, f"靓号{len(self.found_addresses)}")
+        
+        def progress(average_speed):
+            found = len(self.found_addresses)
+            return found, self.target_count, self.planner.format_eta(average_speed, found)
         
+        self.search(lambda address: self.check_pattern(address, self.patterns),
+                    on_hit, should_continue, progress)
+
+    def search(self, match_fn, on_hit, should_continue, progress):
+        """通用搜索循环，generate_addresses和多任务调度器共用
+
+        match_fn(address): 返回命中信息，假值表示未命中
+        on_hit(wallet, matched): 处理命中的钱包
+        should_continue(): 每一批次开始前调用，返回False时结束（可以在其中阻塞等待）
+        progress(average_speed): 返回 (已找到, 目标数量, 预计剩余文本或None)，供速度线程显示
+        """
         # 开始生成前初始化计数器和启动统计线程
-        self.last_time = time.time()
+        self._progress = progress
+        self.start_time = time.time()
+        self.rate_start_time = self.start_time
+        self.rate_start_count = 0
+        self.last_time = self.start_time
         self.last_count = 0
         self.total_generated = 0
         self.running = True
         
         # 如果线程还没启动，则启动它
-        if not self.speed_thread.is_alive():
+        if self.speed_thread is None or not self.speed_thread.is_alive():
+            self.speed_thread = threading.Thread(target=self._print_speed)
+            self.speed_thread.daemon = True
             self.speed_thread.start()
         
-        while len(self.found_addresses) < count and self.running:
-            wallet = self.generate_wallet()
-            self.total_generated += 1
-            
-            if self.check_pattern(wallet['address'], patterns):
-                # 在输出新发现之前打印一个换行，以免覆盖速度显示
-                print("\n")  # 额外的换行确保与速度显示分开
-                print(f"靓号{len(self.found_addresses) + 1}地址: {wallet['address']}")
-                if wallet['mnemonic']:  # 只有在有助记词时才显示
-                    print(f"助记词: {wallet['mnemonic']}")
-                print(f"私钥: {wallet['private_key']}")
-                print("-" * 50)
+        # 未启用性能分析时使用空计时器，搜索循环只有一份
+        timer = self.profiler or NULL_PROFILER
+        timer.start()
+        try:
+            while self.running and should_continue():
+                wallets = self.generate_wallets(timer)
                 
-                self.found_addresses.append(wallet)
-                self.save_to_file(wallet)
+                t = timer.now()
+                hit = None
+                for wallet in wallets:
+                    self.total_generated += 1
+                    matched = match_fn(wallet['address'])
+                    if matched:
+                        hit = wallet
+                        # 同一组的私钥可以互相推导，命中后丢弃该组其余变体
+                        break
+                t = timer.add('match', t, len(wallets))
+                if hit is not None:
+                    on_hit(hit, matched)
+                    timer.add('save', t)
+        finally:
+            timer.stop()
+            timer.report()
+
+    def update_patterns(self, patterns=None, count=None, mode=None):
+        """运行中替换靓号模式、目标数量和生成模式，在下一批次开始时一起生效，计数器保持不变
+
+        参数为None表示保持不变；下一批次开始前多次调用会合并
+        """
+        with self.config_lock:
+            pending = self._pending_config or {}
+            for key, value in (('patterns', patterns), ('count', count), ('mode', mode)):
+                if value is not None:
+                    pending[key] = value
+            self._pending_config = pending
+
+    def _apply_pending_config(self):
+        """在批次边界应用待生效的配置"""
+        with self.config_lock:
+            pending = self._pending_config
+            self._pending_config = None
+        self.patterns = pending.get('patterns', self.patterns)
+        self.target_count = pending.get('count', self.target_count)
+        mode = pending.get('mode', self.mode)
+        if mode != self.mode:
+            self.mode = mode
+            # 两种模式速度相差几个数量级，预计剩余时间从切换时重新计算平均速度
+            self.rate_start_time = time.time()
+            self.rate_start_count = self.total_generated
+        self.planner = DifficultyPlanner(self.patterns, self.target_count)
+        print(f"\n已更新靓号模式: {','.join(p.strip() for p in self.patterns if p.strip())} | "
+              f"目标数量: {self.target_count} | "
+              f"生成模式: {'助记词' if self.mode == 'mnemonic' else '私钥'}")
+
+    def report_found(self, wallet, title, notes=()):
+        """输出并保存找到的靓号"""
+        # 在输出新发现之前打印一个换行，以免覆盖速度显示
+        print("\n")  # 额外的换行确保与速度显示分开
+        print(f"{title}地址: {wallet['address']}")
+        if wallet['mnemonic']:  # 只有在有助记词时才显示
+            print(f"助记词: {wallet['mnemonic']}")
+        print(f"私钥: {wallet['private_key']}")
+        for note in notes:
+            print(note)
+        print("-" * 50)
+        
+        self.save_to_file(wallet)
     
     def save_to_file(self, wallet):
         """保存钱包信息到文件"""
@@ -236,10 +421,37 @@ class USDTAddressGenerator:
     def stop(self):
         """停止速度统计线程"""
         self.running = False
-        if self.speed_thread.is_alive():
+        if self.speed_thread and self.speed_thread.is_alive():
             self.speed_thread.join()
 
-def main():
+def positive_float(value):
+    """argparse用：正数"""
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"必须为正数: {value}")
+    return number
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='USDT靓号生成器')
+    parser.add_argument('--profile', action='store_true',
+                        help='启用分阶段计时，结束时输出各阶段耗时表')
+    parser.add_argument('--profile-sampling', action='store_true',
+                        help='同时启用采样分析，输出火焰图用的collapsed-stack文件（隐含--profile）')
+    parser.add_argument('--profile-interval', type=float, default=0.01,
+                        help='采样间隔（秒），默认0.01')
+    parser.add_argument('--deadline', type=positive_float,
+                        help='期望完成时间（小时），用于估算需要多少个工作单元')
+    parser.add_argument('--jobs', action='store_true',
+                        help='多任务模式：多个订单共用同一个候选地址流，可在运行中添加/暂停/取消任务')
+    args = parser.parse_args(argv)
+    if args.jobs and args.deadline:
+        parser.error('--deadline 不能与 --jobs 一起使用，多任务模式下每个任务单独估算难度')
+
+    profiler = None
+    if args.profile or args.profile_sampling:
+        profiler = SearchProfiler(sampling=args.profile_sampling,
+                                  interval=args.profile_interval)
+
     # 选择生成模式
     while True:
         mode = input("\n请选择生成模式 (1: 助记词模式, 2: 私钥模式): ").strip()
@@ -250,12 +462,29 @@ def main():
     mode = 'mnemonic' if mode == '1' else 'privatekey'
     
     # 创建生成器实例（自动选择最优设备）
-    generator = USDTAddressGenerator(mode=mode)
+    generator = USDTAddressGenerator(mode=mode, profiler=profiler)
     
+    if args.jobs:
+        run_job_console(generator)
+        return
+
     # 设置靓号模式
     patterns = input("\n请输入想要的靓号模式（多个用逗号分隔，如：888,666,999）: ").split(',')
     count = int(input("请输入想要生成的靓号数量: "))
     
+    # 开始前估算难度，明显无法完成时先确认
+    planner = DifficultyPlanner(patterns, count)
+    if not planner.reachable:
+        print(planner.report())
+        return
+    rate = benchmark(generator)
+    deadline = args.deadline * 3600 if args.deadline is not None else None
+    print(f"\n{planner.report(rate=rate, deadline=deadline)}")
+    if planner.out_of_reach(rate):
+        answer = input("\n按当前速度很可能无法在合理时间内完成，是否继续？(y/N): ").strip().lower()
+        if answer != 'y':
+            return
+    
     print(f"\n开始生成靓号 (使用{('助记词' if mode == 'mnemonic' else '私钥')}模式)，请稍等...")
     start_time = time.time()
     
@@ -271,5 +500,76 @@ def main():
     print(f"总共尝试生成: {generator.total_generated} 个地址")
     print(f"生成的靓号地址已保存到 found_addresses.json 文件中")
 
+JOB_CONSOLE_HELP = """可用命令:
+  add <模式,模式,...> <数量> [优先级] [名称]   添加任务
+  list                                      列出任务
+  pause <任务ID>                            暂停任务
+  resume <任务ID>                           恢复任务
+  cancel <任务ID>                           取消任务
+  quit                                      停止并退出"""
+
+JOB_ACTION_NAMES = {'pause': '暂停', 'resume': '恢复', 'cancel': '取消'}
+
+def run_job_console(generator):
+    """多任务模式的命令行交互：搜索在后台线程运行，前台读取命令"""
+    scheduler = JobScheduler(generator)
+    search_thread = threading.Thread(target=scheduler.run)
+    search_thread.daemon = True
+    
+    # 先测量一次速度，添加任务时据此估算耗时；运行后由调度器按平均速度更新
+    scheduler.rate = benchmark(generator)
+    print(f"\n当前速度约 {scheduler.rate:.2f} 个/秒")
+    print(f"\n{JOB_CONSOLE_HELP}")
+    search_thread.start()
+    start_time = time.time()
+    
+    try:
+        while True:
+            parts = input("\n> ").split()
+            if not parts:
+                continue
+            command, params = parts[0].lower(), parts[1:]
+            try:
+                if command == 'add':
+                    patterns = params[0].split(',')
+                    count = int(params[1])
+                    priority = float(params[2]) if len(params) > 2 else 1
+                    name = params[3] if len(params) > 3 else ''
+                    planner = DifficultyPlanner(patterns, count)
+                    print(planner.report(rate=scheduler.rate))
+                    if not planner.reachable:
+                        continue
+                    if planner.out_of_reach(scheduler.rate):
+                        answer = input("按当前速度很可能无法在合理时间内完成，是否仍然添加？(y/N): ")
+                        if answer.strip().lower() != 'y':
+                            continue
+                    job_id = scheduler.submit(patterns, count, priority, name)
+                    print(f"已添加任务 {job_id}")
+                elif command == 'list':
+                    for job in scheduler.list_jobs():
+                        print(f"{job['job_id']:>4} {job['name']:<12} {job['status']:<10} "
+                              f"{job['found']}/{job['count']}  优先级: {job['priority']}  "
+                              f"模式: {','.join(job['patterns'])}  {job['eta']}")
+                elif command in ('pause', 'resume', 'cancel'):
+                    if getattr(scheduler, command)(int(params[0])):
+                        print(f"任务 {params[0]} 已{JOB_ACTION_NAMES[command]}")
+                    else:
+                        print(f"任务 {params[0]} 不存在或当前状态不允许该操作")
+                elif command in ('quit', 'exit'):
+                    break
+                else:
+                    print(JOB_CONSOLE_HELP)
+            except (IndexError, ValueError) as e:
+                print(f"命令参数错误: {str(e) or command}")
+    except (KeyboardInterrupt, EOFError):
+        print("\n程序已停止")
+    finally:
+        scheduler.stop()
+        search_thread.join()
+    
+    print(f"\n总共耗时: {time.time() - start_time:.2f} 秒")
+    print(f"总共尝试生成: {generator.total_generated} 个地址")
+    print(f"生成的靓号地址已保存到 found_addresses.json 文件中")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,37 +5,19 @@ import threading
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QLineEdit, QRadioButton, 
                             QPushButton, QTextEdit, QGroupBox, QButtonGroup,
-                            QMessageBox, QStatusBar, QScrollBar, QDialog)
+                            QMessageBox, QStatusBar, QScrollBar, QDialog,
+                            QCheckBox)
 from PyQt6.QtCore import Qt, pyqtSignal, QThread
 from PyQt6.QtGui import QFont, QIcon
-from main import USDTAddressGenerator
+from session import GeneratorSession
+from planner import DifficultyPlanner, benchmark
+from profiler import SearchProfiler
 from playsound import playsound
 import os
 import json
 from datetime import datetime
 import glob
 
-class GeneratorThread(QThread):
-    """生成器线程"""
-    progress = pyqtSignal(str)  # 进度信号
-    finished = pyqtSignal()     # 完成信号
-    error = pyqtSignal(str)     # 错误信号
-
-    def __init__(self, generator, patterns, count):
-        super().__init__()
-        self.generator = generator
-        self.patterns = patterns
-        self.count = count
-        self.is_running = True
-
-    def run(self):
-        try:
-            self.generator.generate_addresses(self.patterns, self.count)
-        except Exception as e:
-            self.error.emit(str(e))
-        finally:
-            self.finished.emit()
-
 class RedirectText(io.StringIO):
     def __init__(self, signal, speed_signal):
         super().__init__()
@@ -128,11 +110,17 @@ class ResultDialog(QDialog):
 class MainWindow(QMainWindow):
     update_text = pyqtSignal(str)
     update_speed = pyqtSignal(str)  # 添加速度更新信号
+    generation_done = pyqtSignal()       # 生成完成信号（从工作线程发出）
+    generation_failed = pyqtSignal(str)  # 生成出错信号（从工作线程发出）
 
     def __init__(self):
         super().__init__()
-        self.generator = None
-        self.generator_thread = None
+        # 生成会话在第一次开始时创建，之后一直复用（设备只初始化一次）
+        self.session = None
+        # 各生成模式的实测速度（个/秒），用于开始前估算耗时
+        self.measured_rates = {}
+        self.generation_done.connect(self.generation_finished)
+        self.generation_failed.connect(self.generation_error)
         self.init_ui()
         
         # 获取当前目录的绝对路径
@@ -212,6 +200,10 @@ class MainWindow(QMainWindow):
         count_layout.addWidget(self.count_input)
         settings_layout.addLayout(count_layout)
 
+        # 性能分析开关
+        self.profile_checkbox = QCheckBox('性能分析（输出分阶段耗时表和火焰图数据）')
+        settings_layout.addWidget(self.profile_checkbox)
+
         settings_group.setLayout(settings_layout)
         main_layout.addWidget(settings_group)
 
@@ -240,12 +232,14 @@ class MainWindow(QMainWindow):
         self.speed_label = QLabel('当前速度: <span style="color: red">0</span> 个/秒')
         self.total_label = QLabel('已尝试: <span style="color: red">0</span> 个')
         self.found_label = QLabel('已找到: <span style="color: red">0/0</span> 个')
+        self.eta_label = QLabel('预计剩余: <span style="color: red">-</span>')
         
         # 设置字体和样式
         font = QFont('Arial', 14, QFont.Weight.Bold)  # 增大字体到14号
         self.speed_label.setFont(font)
         self.total_label.setFont(font)
         self.found_label.setFont(font)
+        self.eta_label.setFont(font)
         
         # 设置样式表
         style = """
@@ -259,16 +253,19 @@ class MainWindow(QMainWindow):
         self.speed_label.setStyleSheet(style)
         self.total_label.setStyleSheet(style)
         self.found_label.setStyleSheet(style)
+        self.eta_label.setStyleSheet(style)
         
         # 启用富文本
         self.speed_label.setTextFormat(Qt.TextFormat.RichText)
         self.found_label.setTextFormat(Qt.TextFormat.RichText)
+        self.eta_label.setTextFormat(Qt.TextFormat.RichText)
         self.total_label.setTextFormat(Qt.TextFormat.RichText)
         
         # 添加到布局
         speed_layout.addWidget(self.speed_label)
         speed_layout.addWidget(self.total_label)
         speed_layout.addWidget(self.found_label)
+        speed_layout.addWidget(self.eta_label)
         speed_frame.setLayout(speed_layout)
         
         # 添加到主布局
@@ -357,30 +354,75 @@ class MainWindow(QMainWindow):
         count = int(self.count_input.text())
         mode = 'mnemonic' if self.mnemonic_radio.isChecked() else 'privatekey'
 
-        # 更新界面状态
-        self.start_button.setEnabled(False)
-        self.stop_button.setEnabled(True)
-        self.statusBar.showMessage('正在生成中...')
-        self.output_text.clear()
-
+        # 开始前估算难度
+        planner = DifficultyPlanner(patterns, count)
+        if not planner.reachable:
+            QMessageBox.warning(self, '错误', planner.report())
+            return
         try:
-            # 创建生成器实例
-            self.generator = USDTAddressGenerator(mode=mode)
-            
-            # 创建并启动生成线程
-            self.generator_thread = GeneratorThread(self.generator, patterns, count)
-            self.generator_thread.finished.connect(self.generation_finished)
-            self.generator_thread.error.connect(self.generation_error)
-            self.generator_thread.start()
+            rate = self.measure_rate(mode)
+        except Exception as e:
+            self.statusBar.showMessage(f'错误: {str(e)}')
+            return
+        if rate and planner.out_of_reach(rate):
+            reply = QMessageBox.question(
+                self, '难度过高',
+                f"{planner.report(rate=rate)}\n\n按当前速度很可能无法在合理时间内完成，是否继续？",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                return
 
+        try:
+            profiler = None
+            if self.profile_checkbox.isChecked():
+                profiler = SearchProfiler(sampling=True,
+                                          output_dir=os.path.dirname(self.result_file))
+
+            # 在会话的工作线程中开始生成；正在运行时session.start转为热更新并返回False
+            started = self.session.start(patterns, count, mode=mode, profiler=profiler,
+                                         on_finished=self.on_session_finished)
         except Exception as e:
             self.statusBar.showMessage(f'错误: {str(e)}')
             self.stop_generation()
+            return
+
+        if not started:
+            self.statusBar.showMessage('已更新靓号模式，将在下一批次生效')
+            return
+
+        # 更新界面状态
+        self.start_button.setText('更新模式')
+        self.stop_button.setEnabled(True)
+        self.statusBar.showMessage('正在生成中...')
+        self.output_text.clear()
+        self.eta_label.setText('预计剩余: <span style="color: red">-</span>')
+        self.append_text(planner.report(rate=rate) + '\n')
+
+    def measure_rate(self, mode):
+        """获取指定生成模式的速度，第一次使用时试运行测量；运行中返回None"""
+        # 创建生成会话（只在第一次创建）
+        if self.session is None:
+            self.session = GeneratorSession(mode=mode)
+        if mode not in self.measured_rates:
+            if self.session.running:
+                return None
+            self.session.generator.mode = mode
+            self.statusBar.showMessage('正在测量生成速度...')
+            self.measured_rates[mode] = benchmark(self.session.generator)
+        return self.measured_rates[mode]
+
+    def on_session_finished(self, error):
+        """工作线程中的回调，转发为Qt信号"""
+        if error is not None:
+            self.generation_failed.emit(str(error))
+        self.generation_done.emit()
 
     def stop_generation(self):
-        if self.generator:
-            self.generator.stop()
+        if self.session:
+            self.session.stop()
         
+        self.start_button.setText('开始生成')
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         self.statusBar.showMessage('已停止')
@@ -394,6 +436,9 @@ class MainWindow(QMainWindow):
             pass
 
     def generation_finished(self):
+        # 停止后立即重新开始时，上一次搜索的完成信号可能晚到，忽略
+        if self.session and self.session.running:
+            return
         self.statusBar.showMessage('完成')
         self.stop_generation()
         # 更新文件路径显示（包含文件大小）
@@ -407,12 +452,14 @@ class MainWindow(QMainWindow):
         self.activateWindow()
 
     def generation_error(self, error_msg):
+        if self.session and self.session.running:
+            return
         self.statusBar.showMessage(f'错误: {error_msg}')
         self.stop_generation()
 
     def closeEvent(self, event):
-        if self.generator:
-            self.generator.stop()
+        if self.session:
+            self.session.close()
         event.accept()
 
     def update_speed_label(self, text):
@@ -440,6 +487,9 @@ class MainWindow(QMainWindow):
                 self.speed_label.setText(f"当前速度: <span style='color: red'>{speed_formatted}</span> 个/秒")
                 self.found_label.setText(f"已找到: <span style='color: red'>{found_nums}</span>")
                 self.total_label.setText(f"已尝试: <span style='color: red'>{total_num}</span>")
+                if len(parts) >= 4:
+                    eta_text = parts[3].split(':', 1)[1].strip()
+                    self.eta_label.setText(f"预计剩余: <span style='color: red'>{eta_text}</span>")
         except:
             pass
 
@@ -0,0 +1,227 @@
+import math
+import time
+from collections import Counter
+
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+# 不区分大小写时，每个小写字符对应的base58字符个数（如 'a' 对应 'A','a'；'l' 只对应 'L'）
+CASE_FOLD_COUNTS = Counter(c.lower() for c in BASE58_ALPHABET)
+
+# 剩余数量超过该值时分位数改用正态近似，精确计算是O(count)的循环
+EXACT_QUANTILE_LIMIT = 1000
+
+# 预计耗时（p90）超过该值时在开始前给出警告：30天
+UNREACHABLE_SECONDS = 30 * 24 * 3600
+
+
+def normalize_patterns(patterns):
+    """与check_pattern相同：去掉空白、转小写、移除空字符串和重复项"""
+    result = []
+    for pattern in patterns:
+        pattern = pattern.strip().lower()
+        if pattern and pattern not in result:
+            result.append(pattern)
+    return result
+
+
+def pattern_probability(pattern):
+    """单个模式的匹配概率
+
+    地址是 0x41+20字节哈希+4字节校验 的base58编码，末尾k位等于该整数对58^k取模，
+    而低192位是均匀的，所以末尾每一位都独立均匀地取58个字符之一。
+    """
+    p = 1.0
+    for c in pattern.strip().lower():
+        p *= CASE_FOLD_COUNTS.get(c, 0) / 58
+    return p
+
+
+def minimal_patterns(patterns):
+    """去掉被更短模式覆盖的模式（如有 "88" 时 "888" 不会增加命中）"""
+    patterns = normalize_patterns(patterns)
+    return [p for p in patterns
+            if not any(q != p and p.endswith(q) for q in patterns)]
+
+
+def match_probability(patterns):
+    """多个模式的精确匹配概率
+
+    去掉被覆盖的模式后，剩下的模式两两互不为后缀，一个地址不可能同时以两者结尾，
+    因此各事件互斥，概率直接相加。
+    """
+    return sum(pattern_probability(p) for p in minimal_patterns(patterns))
+
+
+def attempts_cdf(attempts, p, count):
+    """尝试attempts次后至少找到count个的概率，即 P(Binomial(attempts, p) >= count)"""
+    if count <= 0:
+        return 1.0
+    if attempts < count or p <= 0:
+        return 0.0
+    if p >= 1:
+        return 1.0
+    # 用相邻项之比递推 log P(X=i)，避免尝试次数很大时lgamma相减丢失精度
+    log_odds = math.log(p) - math.log1p(-p)
+    log_term = attempts * math.log1p(-p)
+    below = 0.0
+    for i in range(count):
+        below += math.exp(log_term)
+        log_term += math.log((attempts - i) / (i + 1)) + log_odds
+    return max(0.0, 1.0 - below)
+
+
+def normal_quantile(q):
+    """标准正态分布的分位数"""
+    lo, hi = -10.0, 10.0
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        if 0.5 * (1 + math.erf(mid / math.sqrt(2))) < q:
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+
+def attempts_quantile(p, count, q):
+    """以概率q找到count个所需的尝试次数（负二项分布分位数）
+
+    count较大时负二项分布已接近正态，直接用均值和标准差估算
+    """
+    if count <= 0:
+        return 0.0
+    if p <= 0:
+        return math.inf
+    if count > EXACT_QUANTILE_LIMIT:
+        mean = count / p
+        sd = math.sqrt(count * (1 - p)) / p
+        return max(float(count), mean + normal_quantile(q) * sd)
+    lo, hi = float(count), max(count / p, float(count))
+    while attempts_cdf(hi, p, count) < q:
+        lo, hi = hi, hi * 2
+    # 相对精度0.1%即可
+    while hi - lo > max(1.0, lo * 1e-3):
+        mid = (lo + hi) / 2
+        if attempts_cdf(mid, p, count) < q:
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+
+def format_duration(seconds):
+    """把秒数格式化为易读的时间"""
+    if seconds == math.inf:
+        return '永远'
+    if seconds < 1:
+        return '<1秒'
+    for unit, size in (('年', 365 * 24 * 3600), ('天', 24 * 3600), ('小时', 3600), ('分钟', 60)):
+        if seconds >= size:
+            return f"{seconds / size:.1f}{unit}"
+    return f"{seconds:.0f}秒"
+
+
+def format_attempts(attempts):
+    if attempts == math.inf:
+        return '∞'
+    return f"{attempts:,.0f}"
+
+
+def benchmark(generator, duration=0.5):
+    """在当前模式下试运行一小段时间，测量每秒可检查的候选地址数"""
+    checked = 0
+    start = time.perf_counter()
+    while True:
+        checked += len(generator.generate_wallets())
+        elapsed = time.perf_counter() - start
+        if elapsed >= duration:
+            return checked / elapsed
+
+
+class DifficultyPlanner:
+    """靓号难度估算、剩余时间预测和吞吐量规划"""
+
+    def __init__(self, patterns, count):
+        self.patterns = normalize_patterns(patterns)
+        self.count = count
+        self.probability = match_probability(self.patterns)
+        self._quantile_cache = {}
+
+    @property
+    def reachable(self):
+        return self.probability > 0
+
+    def expected_attempts(self, found=0):
+        remaining = max(self.count - found, 0)
+        if remaining == 0:
+            return 0.0
+        return remaining / self.probability if self.probability > 0 else math.inf
+
+    def quantile_attempts(self, q, found=0):
+        remaining = max(self.count - found, 0)
+        key = (remaining, q)
+        if key not in self._quantile_cache:
+            # 只有剩余数量变化时才需要重算，旧的结果不再用到
+            if len(self._quantile_cache) >= 16:
+                self._quantile_cache.clear()
+            self._quantile_cache[key] = attempts_quantile(self.probability, remaining, q)
+        return self._quantile_cache[key]
+
+    def estimate(self, rate, found=0):
+        """按给定速度（个/秒）估算剩余时间：期望值、p50、p90"""
+        if rate <= 0:
+            return None
+        return {
+            'expected': self.expected_attempts(found) / rate,
+            'p50': self.quantile_attempts(0.5, found) / rate,
+            'p90': self.quantile_attempts(0.9, found) / rate,
+        }
+
+    def recommend_workers(self, rate_per_worker, deadline, confidence=0.9):
+        """在deadline秒内以confidence的把握完成，需要多少个同等速度的工作单元（进程/设备）"""
+        if deadline <= 0:
+            raise ValueError('期限必须为正数')
+        attempts = self.quantile_attempts(confidence)
+        if attempts == math.inf or rate_per_worker <= 0:
+            return math.inf
+        return max(1, math.ceil(attempts / (rate_per_worker * deadline)))
+
+    def format_eta(self, rate, found=0):
+        """生成速度行中的剩余时间部分"""
+        eta = self.estimate(rate, found)
+        if eta is None:
+            return '预计剩余: 计算中'
+        return f"预计剩余: p50 {format_duration(eta['p50'])} / p90 {format_duration(eta['p90'])}"
+
+    def report(self, rate=None, deadline=None):
+        """开始前的难度报告，返回文本"""
+        lines = ["难度估算:"]
+        for pattern in self.patterns:
+            p = pattern_probability(pattern)
+            if p > 0:
+                lines.append(f"  {pattern}: 概率 1/{format_attempts(1 / p)}")
+            else:
+                impossible = ''.join(sorted({c for c in pattern if not CASE_FOLD_COUNTS.get(c)}))
+                lines.append(f"  {pattern}: 包含不可能出现的字符({impossible})，不可能匹配")
+        if not self.reachable:
+            lines.append("所有模式都不可能匹配")
+            return '\n'.join(lines)
+
+        lines.append(f"  任一模式命中概率: 1/{format_attempts(1 / self.probability)}")
+        lines.append(f"  找到{self.count}个预计尝试: {format_attempts(self.expected_attempts())} 次 "
+                     f"(p50 {format_attempts(self.quantile_attempts(0.5))} / "
+                     f"p90 {format_attempts(self.quantile_attempts(0.9))})")
+        if rate:
+            eta = self.estimate(rate)
+            lines.append(f"  按当前速度 {rate:.2f} 个/秒: 预计 {format_duration(eta['expected'])} "
+                         f"(p50 {format_duration(eta['p50'])} / p90 {format_duration(eta['p90'])})")
+            if deadline is not None:
+                needed = self.recommend_workers(rate, deadline)
+                lines.append(f"  要在 {format_duration(deadline)} 内完成(90%把握)，"
+                             f"需要约 {needed} 个与当前速度相同的工作单元")
+        return '\n'.join(lines)
+
+    def out_of_reach(self, rate, limit=UNREACHABLE_SECONDS):
+        """按给定速度，p90时间是否超过limit秒（或模式不可能匹配）"""
+        if not self.reachable:
+            return True
+        eta = self.estimate(rate)
+        return eta is not None and eta['p90'] > limit
@@ -0,0 +1,138 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# 搜索循环的各个阶段（按执行顺序）
+STAGES = ('random', 'derive', 'hash', 'encode', 'match', 'save')
+
+
+class NullProfiler:
+    """未启用性能分析时使用的空计时器，接口与SearchProfiler相同"""
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def report(self):
+        pass
+
+    def now(self):
+        return 0.0
+
+    def add(self, stage, start, calls=1):
+        return 0.0
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class SearchProfiler:
+    """搜索循环的低开销性能分析器
+
+    - 分阶段计时：每组候选地址每个阶段只计时一次，add(stage, start, calls) 的calls为本次计时覆盖的地址数
+    - 采样分析（可选）：后台线程定时抓取生成线程的调用栈，汇总为 collapsed-stack 格式，
+      可直接交给 flamegraph.pl / speedscope / inferno 等工具生成火焰图
+    """
+
+    def __init__(self, sampling=False, interval=0.01, output_dir='.'):
+        self.sampling = sampling
+        self.interval = interval  # 采样间隔（秒），默认100Hz
+        self.output_dir = output_dir
+        self.now = time.perf_counter
+        self.reset()
+
+    def reset(self):
+        """清空统计数据"""
+        self.totals = dict.fromkeys(STAGES, 0.0)
+        self.calls = dict.fromkeys(STAGES, 0)
+        self.stacks = Counter()
+        self.samples = 0
+        self.start_time = None
+        self.end_time = None
+        self._target_ident = None
+        self._sampler = None
+        self._sampling_active = False
+
+    def start(self):
+        """开始分析，需要在生成线程中调用"""
+        self.reset()
+        self.start_time = time.perf_counter()
+        if self.sampling:
+            self._target_ident = threading.get_ident()
+            self._sampling_active = True
+            self._sampler = threading.Thread(target=self._sample_loop)
+            self._sampler.daemon = True
+            self._sampler.start()
+
+    def stop(self):
+        """停止分析"""
+        self.end_time = time.perf_counter()
+        self._sampling_active = False
+        if self._sampler and self._sampler.is_alive():
+            self._sampler.join()
+
+    def add(self, stage, start, calls=1):
+        """累计一个阶段的耗时（calls为本次计时覆盖的候选数），返回当前时间，便于串联下一个阶段的计时"""
+        now = time.perf_counter()
+        self.totals[stage] += now - start
+        self.calls[stage] += calls
+        return now
+
+    def _sample_loop(self):
+        """定时抓取生成线程的调用栈"""
+        while self._sampling_active:
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(self._target_ident)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            stack.reverse()
+            self.stacks[';'.join(stack)] += 1
+            self.samples += 1
+
+    def write_collapsed(self, filename=None):
+        """写出 collapsed-stack 文件，每行格式为 "栈帧1;栈帧2;... 采样数" """
+        if filename is None:
+            filename = os.path.join(
+                self.output_dir,
+                f"profile_{time.strftime('%Y%m%d_%H%M%S')}.folded")
+        with open(filename, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return filename
+
+    def format_table(self):
+        """生成分阶段耗时表"""
+        end_time = self.end_time if self.end_time is not None else time.perf_counter()
+        wall = end_time - self.start_time if self.start_time is not None else 0.0
+        measured = sum(self.totals.values())
+
+        lines = [f"{'阶段':<8}{'次数':>14}{'总耗时(秒)':>14}{'平均(微秒)':>14}{'占比':>9}"]
+        for stage in STAGES:
+            total = self.totals[stage]
+            calls = self.calls[stage]
+            avg = total / calls * 1e6 if calls else 0.0
+            share = total / measured * 100 if measured else 0.0
+            lines.append(f"{stage:<10}{calls:>14}{total:>16.3f}{avg:>16.2f}{share:>10.1f}%")
+        lines.append(f"阶段合计: {measured:.3f} 秒 | 总运行时间: {wall:.3f} 秒 | "
+                     f"未计入阶段: {max(wall - measured, 0.0):.3f} 秒")
+        return '\n'.join(lines)
+
+    def report(self):
+        """输出分阶段耗时表，并在启用采样时写出火焰图文件"""
+        print("\n\n性能分析结果:")
+        print(self.format_table())
+        if self.sampling:
+            try:
+                filename = self.write_collapsed()
+                print(f"采样次数: {self.samples}，火焰图数据已保存到 {filename}")
+            except Exception as e:
+                print(f"保存性能分析文件时出错: {str(e)}")
@@ -0,0 +1,194 @@
+import itertools
+import threading
+import time
+
+from planner import DifficultyPlanner
+
+
+class Job:
+    """一个靓号任务（例如一个客户订单）"""
+
+    # 任务状态
+    RUNNING = 'running'
+    PAUSED = 'paused'
+    COMPLETED = 'completed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, job_id, patterns, count, priority=1, name=''):
+        self.job_id = job_id
+        self.name = name or f'job{job_id}'
+        # 与check_pattern相同：去掉空白、转小写、移除空字符串
+        self.patterns = [p for p in (pattern.strip().lower() for pattern in patterns) if p]
+        self.count = count
+        self.priority = priority
+        self.status = Job.RUNNING
+        self.found = []
+        self.submit_time = time.time()
+        self.planner = DifficultyPlanner(self.patterns, count)
+
+    @property
+    def active(self):
+        return self.status == Job.RUNNING
+
+    def to_dict(self, rate=None):
+        return {
+            'job_id': self.job_id,
+            'name': self.name,
+            'patterns': list(self.patterns),
+            'count': self.count,
+            'found': len(self.found),
+            'priority': self.priority,
+            'status': self.status,
+            'eta': self.planner.format_eta(rate, len(self.found)) if rate and self.active else '',
+        }
+
+
+class JobScheduler:
+    """多任务调度器：同一个候选地址流同时匹配所有活动任务
+
+    所有活动任务的模式合并为一个后缀索引 {后缀长度: {后缀: [任务]}}，
+    每个候选地址只需按不同的后缀长度各查一次字典。
+    一个地址同时命中多个任务时，按优先级加权分配给完成度最低的任务。
+    """
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        # (后缀长度列表, 索引)，整体替换，搜索线程无需加锁读取
+        self._pattern_index = ((), {})
+        # 每秒可检查的候选地址数：开始前由benchmark测量，运行中用平均速度更新
+        self.rate = None
+
+    def submit(self, patterns, count, priority=1, name=''):
+        """提交任务，返回任务ID"""
+        if count <= 0:
+            raise ValueError('生成数量必须为正整数')
+        if priority <= 0:
+            raise ValueError('优先级必须为正数')
+        with self.lock:
+            job = Job(next(self._ids), patterns, count, priority, name)
+            if not job.patterns:
+                raise ValueError('请输入靓号模式')
+            self.jobs[job.job_id] = job
+            self._rebuild_index()
+        return job.job_id
+
+    def list_jobs(self):
+        """列出所有任务"""
+        with self.lock:
+            return [job.to_dict(self.rate) for job in self.jobs.values()]
+
+    def pause(self, job_id):
+        return self._set_status(job_id, Job.PAUSED, (Job.RUNNING,))
+
+    def resume(self, job_id):
+        return self._set_status(job_id, Job.RUNNING, (Job.PAUSED,))
+
+    def cancel(self, job_id):
+        return self._set_status(job_id, Job.CANCELLED, (Job.RUNNING, Job.PAUSED))
+
+    def _set_status(self, job_id, status, allowed):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.status not in allowed:
+                return False
+            job.status = status
+            self._rebuild_index()
+        return True
+
+    def active_jobs(self):
+        with self.lock:
+            return [job for job in self.jobs.values() if job.active]
+
+    def _rebuild_index(self):
+        """重建合并后的后缀索引，调用方需持有锁"""
+        index = {}
+        for job in self.jobs.values():
+            if not job.active:
+                continue
+            for pattern in job.patterns:
+                jobs = index.setdefault(len(pattern), {}).setdefault(pattern, [])
+                if job not in jobs:
+                    jobs.append(job)
+        self._pattern_index = (tuple(sorted(index)), index)
+
+    def match(self, address):
+        """返回地址命中的所有任务（不区分大小写）"""
+        lengths, index = self._pattern_index
+        address = address.lower()
+        matched = []
+        for length in lengths:
+            jobs = index[length].get(address[-length:])
+            if jobs:
+                for job in jobs:
+                    if job not in matched:
+                        matched.append(job)
+        return matched
+
+    def _route(self, jobs):
+        """从命中的任务中选出一个：按优先级加权的完成数最少者优先"""
+        candidates = [job for job in jobs if job.active]
+        if not candidates:
+            return None
+        return min(candidates,
+                   key=lambda job: (len(job.found) / job.priority, -job.priority, job.job_id))
+
+    def _assign(self, wallet, jobs):
+        """将命中的钱包分配给一个任务，返回该任务"""
+        with self.lock:
+            job = self._route(jobs)
+            if job is None:
+                return None
+            job.found.append(wallet)
+            if len(job.found) >= job.count:
+                job.status = Job.COMPLETED
+                self._rebuild_index()
+
+        wallet['job'] = job.name
+        notes = [f"[{job.name}] 任务已完成"] if job.status == Job.COMPLETED else []
+        self.generator.report_found(wallet, f"[{job.name}] 靓号{len(job.found)}/{job.count}", notes)
+        return job
+
+    @property
+    def running(self):
+        return self.generator.running
+
+    def run(self, stop_when_idle=False):
+        """搜索主循环，持续运行直到stop()；stop_when_idle为True时所有任务结束后退出"""
+        try:
+            self.generator.search(self.match, self._assign,
+                                  lambda: self._wait_for_jobs(stop_when_idle), self._progress)
+        finally:
+            self.generator.stop()
+
+    def _wait_for_jobs(self, stop_when_idle):
+        """每一批次开始前调用：没有活动任务时等待，返回False表示结束搜索"""
+        while not self._pattern_index[0]:
+            with self.lock:
+                paused = any(job.status == Job.PAUSED for job in self.jobs.values())
+            if not self.generator.running or (stop_when_idle and not paused):
+                return False
+            time.sleep(0.1)
+        return True
+
+    def _progress(self, average_speed):
+        """速度线程显示的总进度，预计剩余时间取最慢的活动任务"""
+        if average_speed > 0:
+            self.rate = average_speed
+        with self.lock:
+            found = sum(len(job.found) for job in self.jobs.values())
+            target = sum(job.count for job in self.jobs.values()
+                         if job.status != Job.CANCELLED)
+            active = [job for job in self.jobs.values() if job.active]
+        eta = None
+        if active and self.rate:
+            # 所有任务共用同一个候选地址流，整体完成时间由最慢的任务决定
+            slowest = max(active, key=lambda job: job.planner.quantile_attempts(0.9, len(job.found)))
+            eta = slowest.planner.format_eta(self.rate, len(slowest.found))
+        return found, target, eta
+
+    def stop(self):
+        """停止搜索"""
+        self.generator.stop()
@@ -0,0 +1,61 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from main import USDTAddressGenerator
+
+
+class GeneratorSession:
+    """长期存活的生成会话
+
+    会话持有一个生成器（计算设备、上下文、命令队列、预计算常量）和一个常驻工作线程，
+    多次开始/停止之间都复用它们；运行中可以替换靓号模式、目标数量和生成模式，
+    新配置在下一批次开始时生效，不需要停止工作线程，也不会清零计数器。
+    """
+
+    def __init__(self, platform_index=None, device_index=None, mode='mnemonic', profiler=None):
+        self.generator = USDTAddressGenerator(platform_index, device_index,
+                                              mode=mode, profiler=profiler)
+        # 搜索循环本身是单线程的，一个常驻工作线程即可
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.future = None
+        self.lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self.future is not None and not self.future.done()
+
+    def start(self, patterns, count, mode=None, profiler=None, on_finished=None):
+        """开始一次搜索；如果已经在运行，则转为热更新
+
+        on_finished(error) 在工作线程中回调，error为None表示正常结束
+        """
+        with self.lock:
+            if self.running:
+                if self.generator.running:
+                    self.update(patterns, count, mode)
+                    return False
+                # 上一次搜索已请求停止但还没退出当前批次，等待它结束
+                self.future.exception()
+
+            if mode is not None:
+                self.generator.mode = mode
+            self.generator.profiler = profiler
+            self.future = self.executor.submit(self.generator.generate_addresses, patterns, count)
+            if on_finished is not None:
+                self.future.add_done_callback(lambda future: on_finished(future.exception()))
+        return True
+
+    def update(self, patterns=None, count=None, mode=None):
+        """运行中替换模式/数量/生成模式，在下一批次开始时一起生效"""
+        self.generator.update_patterns(patterns, count, mode)
+
+    def stop(self, wait=False):
+        """停止当前搜索，保留设备和工作线程以便再次开始"""
+        self.generator.stop()
+        if wait and self.future is not None:
+            self.future.exception()
+
+    def close(self):
+        """停止搜索并释放工作线程"""
+        self.stop()
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,41 @@
+import secrets
+
+from main import (USDTAddressGenerator, SECP256K1_N, GLV_LAMBDA, GLV_LAMBDA2)
+
+
+def make_generator():
+    """不调用__init__，避免初始化OpenCL和Tron客户端"""
+    generator = USDTAddressGenerator.__new__(USDTAddressGenerator)
+    generator.mode = 'privatekey'
+    return generator
+
+
+def test_six_variants_match_private_keys():
+    generator = make_generator()
+    for _ in range(10):
+        private_key = generator.generate_private_key()
+        k = int(private_key, 16)
+        wallets = generator.create_wallets_from_private_key(private_key)
+
+        assert len(wallets) == 6
+        assert len({wallet['address'] for wallet in wallets}) == 6
+
+        for wallet in wallets:
+            expected = generator.create_wallet_from_private_key(wallet['private_key'])
+            assert wallet['address'] == expected['address']
+            assert wallet['mnemonic'] == ''
+
+        expected_keys = set()
+        for multiplier in (1, GLV_LAMBDA, GLV_LAMBDA2):
+            k_i = k * multiplier % SECP256K1_N
+            expected_keys.add(k_i)
+            expected_keys.add(SECP256K1_N - k_i)
+        assert {int(wallet['private_key'], 16) for wallet in wallets} == expected_keys
+
+
+def test_symmetric_keys_first_entry_is_original():
+    generator = make_generator()
+    private_key = secrets.token_hex(32)
+    public_key = generator.derive_public_key(private_key)
+    keys = generator.symmetric_keys(private_key, public_key)
+    assert keys[0] == (f"{int(private_key, 16):064x}", public_key)